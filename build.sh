@@ -60,6 +60,10 @@ if [ ! -d "inkwell/frontend/build" ]; then
     exit 1
 fi
 
+# Regenerate the static API router registry
+echo "🧭 Generating API router registry..."
+python scripts/gen_routes_registry.py
+
 echo "✅ Frontend build completed successfully!"
 echo "📁 Build files copied to: inkwell/frontend/build/"
 echo ""
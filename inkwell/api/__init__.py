@@ -1,75 +1,169 @@
 """Auto-discovery system for API endpoints"""
 
+import functools
 import importlib
+import logging
 import pkgutil
+import sys
 from pathlib import Path
-from typing import List
-from fastapi import APIRouter, FastAPI
+from typing import TYPE_CHECKING, List, Tuple
 
+if TYPE_CHECKING:
+    from fastapi import APIRouter, FastAPI
 
-def discover_and_register_routers(app: FastAPI) -> None:
+logger = logging.getLogger(__name__)
+
+try:
+    from ._registry import ROUTERS
+except ImportError:
+    ROUTERS = None
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_route_modules() -> Tuple[Tuple[str, str, str], ...]:
+    """
+    Return (module_name, routes_module_path, router_attr) triples for every API subpackage.
+
+    Uses the static registry generated by scripts/gen_routes_registry.py when
+    it is available, so startup imports the listed modules without touching
+    the filesystem. Otherwise the api package is scanned once for
+    subpackages, skipping names that start with an underscore; subpackages
+    without a routes.py are skipped when they fail to import.
+    """
+    if ROUTERS is not None:
+        return tuple(
+            (routes_module_path.rsplit('.', 2)[-2], routes_module_path, attr)
+            for routes_module_path, attr in ROUTERS
+        )
+
+    api_path = Path(__file__).parent
+    return tuple(
+        (module.name, f"inkwell.api.{module.name}.routes", 'router')
+        for module in pkgutil.iter_modules([str(api_path)])
+        if module.ispkg and not module.name.startswith('_')
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _import(module_path: str):
+    """Import a module once and memoize it for later lookups"""
+    return importlib.import_module(module_path)
+
+
+def _cached_import(module_path: str, attr: str):
+    """
+    Return an attribute from a module, skipping the import machinery when the
+    module is already fully loaded.
+    """
+    module = sys.modules.get(module_path)
+    if module is None or getattr(getattr(module, '__spec__', None), '_initializing', False):
+        module = _import(module_path)
+    return getattr(module, attr)
+
+
+def __getattr__(name: str):
+    """
+    Resolve <module>_router attributes (e.g. prompts_router) on first access,
+    so importing inkwell.api alone doesn't import any route module.
+    """
+    if name.endswith('_router'):
+        route_modules = {
+            module_name: (routes_module_path, attr)
+            for module_name, routes_module_path, attr in _discover_route_modules()
+        }
+        entry = route_modules.get(name[:-len('_router')])
+        if entry is not None:
+            return _cached_import(*entry)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _pin_async_library() -> None:
+    """
+    Tell sniffio (when installed) that the server runs on asyncio, so anyio's
+    backend detection returns the cached answer instead of inspecting the loop.
+    """
+    try:
+        import sniffio
+    except ImportError:
+        return
+    sniffio.current_async_library_cvar.set("asyncio")
+
+
+def _include_unique_routes(aggregate: "APIRouter", router: "APIRouter", seen: set, module_name: str) -> None:
+    """
+    Add a router's routes to the aggregate router, skipping any (method, path)
+    pair that is already registered so the route table never holds duplicates.
+    """
+    for route in router.routes:
+        path = getattr(route, 'path', None)
+        keys = {(method, path) for method in (getattr(route, 'methods', None) or {None})}
+        duplicates = keys & seen
+        if duplicates:
+            for method, duplicate_path in sorted(duplicates, key=str):
+                logger.warning("Skipping duplicate route %s %s from %s/routes.py", method, duplicate_path, module_name)
+            continue
+        seen.update(keys)
+        aggregate.routes.append(route)
+
+
+def discover_and_register_routers(app: "FastAPI") -> None:
     """
     Automatically discover and register all API routers from subdirectories.
-    
+
     Each subdirectory in the api package should contain a routes.py file
     that exports a router variable (APIRouter instance).
     """
-    api_path = Path(__file__).parent
-    
-    # Find all subdirectories in the api package
-    for item in api_path.iterdir():
-        if item.is_dir() and not item.name.startswith('_'):
-            module_name = item.name
-            routes_file = item / 'routes.py'
-            
-            if routes_file.exists():
-                try:
-                    # Import the routes module dynamically
-                    routes_module_path = f"inkwell.api.{module_name}.routes"
-                    routes_module = importlib.import_module(routes_module_path)
-                    
-                    # Look for a router variable in the module
-                    if hasattr(routes_module, 'router'):
-                        router = getattr(routes_module, 'router')
-                        if isinstance(router, APIRouter):
-                            # Register the router with the app
-                            app.include_router(router)
-                            print(f"✅ Registered API router: {module_name}")
-                        else:
-                            print(f"⚠️  Warning: {module_name}/routes.py has 'router' but it's not an APIRouter")
-                    else:
-                        print(f"⚠️  Warning: {module_name}/routes.py doesn't export a 'router' variable")
-                        
-                except ImportError as e:
-                    print(f"❌ Error importing {module_name}/routes.py: {e}")
-                except Exception as e:
-                    print(f"❌ Error registering router from {module_name}: {e}")
-
-
-def get_all_routers() -> List[APIRouter]:
+    from fastapi import APIRouter
+
+    _pin_async_library()
+
+    # Collect every router into one parent so the app registers routes in a single pass
+    aggregate = APIRouter()
+    registered_routes = set()
+
+    for module_name, routes_module_path, attr in _discover_route_modules():
+        try:
+            # Import the routes module and fetch its router variable
+            router = _cached_import(routes_module_path, attr)
+            if isinstance(router, APIRouter):
+                _include_unique_routes(aggregate, router, registered_routes, module_name)
+                logger.debug("Registered API router: %s", module_name)
+            else:
+                logger.warning("%s/routes.py has 'router' but it's not an APIRouter", module_name)
+
+        except AttributeError:
+            logger.warning("%s/routes.py doesn't export a 'router' variable", module_name)
+        except ModuleNotFoundError as e:
+            if e.name != routes_module_path:
+                logger.error("Error importing %s/routes.py: %s", module_name, e)
+        except ImportError as e:
+            logger.error("Error importing %s/routes.py: %s", module_name, e)
+        except Exception as e:
+            logger.error("Error registering router from %s: %s", module_name, e)
+
+    # Register all discovered routes with the app at once
+    app.include_router(aggregate)
+
+
+def get_all_routers() -> List["APIRouter"]:
     """
     Get all discovered API routers.
     This is an alternative approach that returns routers instead of registering them.
     """
+    from fastapi import APIRouter
+
     routers = []
-    api_path = Path(__file__).parent
-    
-    for item in api_path.iterdir():
-        if item.is_dir() and not item.name.startswith('_'):
-            module_name = item.name
-            routes_file = item / 'routes.py'
-            
-            if routes_file.exists():
-                try:
-                    routes_module_path = f"inkwell.api.{module_name}.routes"
-                    routes_module = importlib.import_module(routes_module_path)
-                    
-                    if hasattr(routes_module, 'router'):
-                        router = getattr(routes_module, 'router')
-                        if isinstance(router, APIRouter):
-                            routers.append(router)
-                            
-                except (ImportError, AttributeError) as e:
-                    print(f"❌ Error loading router from {module_name}: {e}")
-    
-    return routers
\ No newline at end of file
+
+    for module_name, routes_module_path, attr in _discover_route_modules():
+        try:
+            router = _cached_import(routes_module_path, attr)
+            if isinstance(router, APIRouter):
+                routers.append(router)
+
+        except ModuleNotFoundError as e:
+            if e.name != routes_module_path:
+                logger.error("Error loading router from %s: %s", module_name, e)
+        except (ImportError, AttributeError) as e:
+            logger.error("Error loading router from %s: %s", module_name, e)
+
+    return routers
@@ -0,0 +1,11 @@
+"""Static API route registry - generated by scripts/gen_routes_registry.py, do not edit"""
+
+# (routes module, router attribute) pairs, imported directly at startup
+ROUTERS = (
+    ("inkwell.api.health.routes", "router"),
+    ("inkwell.api.items.routes", "router"),
+    ("inkwell.api.projects.routes", "router"),
+    ("inkwell.api.prompts.routes", "router"),
+    ("inkwell.api.settings.routes", "router"),
+    ("inkwell.api.users.routes", "router"),
+)
@@ -0,0 +1 @@
+"""Health API package"""
@@ -1,10 +1,14 @@
 """Health check endpoint"""
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 
 router = APIRouter()
 
+# The health payload never changes, so encode it once at import
+_HEALTHY = orjson.dumps({"status": "healthy", "message": "Inkwell API is running"})
+
 @router.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "message": "Inkwell API is running"}
\ No newline at end of file
+    return Response(content=_HEALTHY, media_type="application/json")
\ No newline at end of file
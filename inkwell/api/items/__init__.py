@@ -0,0 +1 @@
+"""Items API package"""
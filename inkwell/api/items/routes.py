@@ -4,16 +4,18 @@ from typing import List
 from fastapi import APIRouter, HTTPException
 
 from ...database import DatabaseManager
+from ...responses import ORJSONResponse
 from .models import Item, ItemCreate, ItemUpdate
 
 router = APIRouter()
 
 
-@router.get("/api/items", response_model=List[Item])
+@router.get("/api/items", response_model=None, responses={200: {"model": List[Item]}})
 async def get_items():
     """Get all items"""
     items = await DatabaseManager.get_items()
-    return items
+    # Rows are already plain dicts - serialize them directly, skipping model validation
+    return ORJSONResponse(content=items)
 
 
 @router.post("/api/items", response_model=Item)
@@ -58,10 +60,6 @@ async def update_item(item_id: int, item_update: ItemUpdate):
 @router.delete("/api/items/{item_id}")
 async def delete_item(item_id: int):
     """Delete an item"""
-    # Check if item exists
-    existing_item = await DatabaseManager.get_item(item_id)
-    if not existing_item:
+    if not await DatabaseManager.delete_item(item_id):
         raise HTTPException(status_code=404, detail="Item not found")
-    
-    await DatabaseManager.delete_item(item_id)
     return {"message": "Item deleted successfully"}
\ No newline at end of file
@@ -1,9 +1,10 @@
 """API routes for projects management"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List, Optional
 from pydantic import BaseModel
 from ...database import DatabaseManager
+from ...responses import ORJSONResponse, not_modified, versions_etag, with_etag
 from .models import Project, ProjectCreate, ProjectUpdate
 
 router = APIRouter()
@@ -13,92 +14,65 @@ class WhiteboardUpdate(BaseModel):
     whiteboard: str
 
 
-@router.get("/api/projects", response_model=List[Project])
-async def get_projects():
-    """Get all projects"""
-    try:
-        projects = await DatabaseManager.get_projects()
-        return projects
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/api/projects", response_model=None, responses={200: {"model": List[Project]}})
+async def get_projects(request: Request):
+    """Get all projects (304 Not Modified if the client's ETag is current)"""
+    versions = await DatabaseManager.get_table_versions()
+    etag = versions_etag(versions, "projects")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    projects = await DatabaseManager.get_projects()
+    # Rows are already plain dicts - serialize them directly, skipping model validation
+    return with_etag(ORJSONResponse(content=projects), etag)
 
 
 @router.get("/api/projects/{project_id}", response_model=Project)
 async def get_project(project_id: int):
     """Get a specific project by ID"""
-    try:
-        project = await DatabaseManager.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        return project
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    project = await DatabaseManager.get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
 
 
 @router.post("/api/projects", response_model=Project)
 async def create_project(project: ProjectCreate):
     """Create a new project"""
-    try:
-        created_project = await DatabaseManager.create_project(project.name)
-        if not created_project:
-            raise HTTPException(status_code=500, detail="Failed to create project")
-        return created_project
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    created_project = await DatabaseManager.create_project(project.name)
+    if not created_project:
+        raise HTTPException(status_code=500, detail="Failed to create project")
+    return created_project
 
 
 @router.put("/api/projects/{project_id}", response_model=Project)
 async def update_project(project_id: int, project: ProjectUpdate):
     """Update a project"""
-    try:
-        # Check if project exists
-        existing_project = await DatabaseManager.get_project(project_id)
-        if not existing_project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Update the project
-        await DatabaseManager.update_project(project_id, project.name, project.whiteboard)
-        
-        # Return the updated project
-        updated_project = await DatabaseManager.get_project(project_id)
-        return updated_project
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Update the project and get it back in one call
+    updated_project = await DatabaseManager.update_project(project_id, project.name, project.whiteboard)
+    if not updated_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return updated_project
 
 
 @router.delete("/api/projects/{project_id}")
 async def delete_project(project_id: int):
     """Delete a project (prompts will be reassigned to Default project)"""
-    try:
-        # Check if project exists
-        existing_project = await DatabaseManager.get_project(project_id)
-        if not existing_project:
+    if not await DatabaseManager.delete_project(project_id):
+        # Nothing was deleted - either the project doesn't exist or it's the Default project
+        if not await DatabaseManager.get_project(project_id):
             raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Don't allow deleting the Default project
-        if existing_project["name"] == "Default":
-            raise HTTPException(status_code=400, detail="Cannot delete the Default project")
-        
-        await DatabaseManager.delete_project(project_id)
-        return {"message": "Project deleted successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=400, detail="Cannot delete the Default project")
+    
+    return {"message": "Project deleted successfully"}
 
 
 @router.put("/api/projects/{project_id}/whiteboard", response_model=Project)
 async def update_project_whiteboard(project_id: int, whiteboard_data: WhiteboardUpdate):
     """Update only the whiteboard content of a project"""
-    try:
-        # Check if project exists
-        existing_project = await DatabaseManager.get_project(project_id)
-        if not existing_project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Update only the whiteboard
-        await DatabaseManager.update_project(project_id, whiteboard=whiteboard_data.whiteboard)
-        
-        # Return the updated project
-        updated_project = await DatabaseManager.get_project(project_id)
-        return updated_project
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    # Update only the whiteboard and get the project back in one call
+    updated_project = await DatabaseManager.update_project(project_id, whiteboard=whiteboard_data.whiteboard)
+    if not updated_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return updated_project
\ No newline at end of file
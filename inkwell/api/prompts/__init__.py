@@ -0,0 +1 @@
+"""Prompts API package"""
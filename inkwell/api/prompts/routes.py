@@ -1,10 +1,11 @@
 """Prompts CRUD endpoints"""
 
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 
 from ...database import DatabaseManager
+from ...responses import ORJSONResponse, ndjson_response, not_modified, versions_etag, wants_ndjson, with_etag
 from .models import Prompt, PromptCreate, PromptUpdate
 
 router = APIRouter()
@@ -14,206 +15,202 @@ class PromptReorderRequest(BaseModel):
     prompt_ids: List[int]
 
 
-@router.get("/api/{project_id}/prompts", response_model=List[Prompt])
+def _project_scope(project_id: int) -> Optional[int]:
+    """Map a project_id path parameter to a project filter (0 means all projects)"""
+    return None if project_id == 0 else project_id
+
+
+# Shared implementations - project_id=None means the request isn't scoped to a project
+
+async def _get_prompts_impl(request: Request, project_id: Optional[int], status: Optional[str], limit: Optional[int], offset: int):
+    """
+    List prompts, optionally filtered by project and status (304 if the client's ETag is current).
+    Clients sending Accept: application/x-ndjson get the rows streamed one per line.
+    """
+    # Prompt rows include the project name, so both tables feed the ETag; the
+    # JSON and NDJSON bodies differ, so each format gets its own ETag
+    versions = await DatabaseManager.get_table_versions()
+    etag = versions_etag(versions, "prompts", "projects")
+    ndjson = wants_ndjson(request)
+    if ndjson:
+        etag = etag[:-1] + '-ndjson"'
+    cached = not_modified(request, etag, vary="Accept")
+    if cached:
+        return cached
+    
+    # Stream rows straight from the cursor when the client accepts NDJSON
+    if ndjson:
+        rows = DatabaseManager.iter_prompts(project_id=project_id, status=status, limit=limit, offset=offset)
+        return with_etag(ndjson_response(rows), etag, vary="Accept")
+    
+    prompts = await DatabaseManager.get_prompts(project_id=project_id, status=status, limit=limit, offset=offset)
+    # Rows are already plain dicts - serialize them directly, skipping model validation
+    return with_etag(ORJSONResponse(content=prompts), etag, vary="Accept")
+
+
+async def _create_prompt_impl(prompt: PromptCreate, project_id: Optional[int]):
+    """Create a prompt, in the given project if one is set"""
+    # A project_id from the URL overrides the one in the request body
+    created_prompt = await DatabaseManager.create_prompt(
+        name=prompt.name,
+        status=prompt.status,
+        content=prompt.content,
+        project_id=prompt.project_id if project_id is None else project_id
+    )
+    if not created_prompt:
+        raise HTTPException(status_code=500, detail="Failed to create prompt")
+    return created_prompt
+
+
+async def _not_found_detail(prompt_id: int, project_id: Optional[int]) -> str:
+    """404 detail for a scoped lookup that missed, matching the unscoped check order"""
+    if project_id is not None and await DatabaseManager.get_prompt(prompt_id):
+        return "Prompt not found in this project"
+    return "Prompt not found"
+
+
+async def _get_prompt_impl(prompt_id: int, project_id: Optional[int]):
+    """Get a prompt by ID, 404 if missing or outside the project"""
+    prompt = await DatabaseManager.get_prompt(prompt_id)
+    if not prompt:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    
+    # When scoped to a project, verify the prompt belongs to it
+    if project_id is not None and prompt.get('project_id') != project_id:
+        raise HTTPException(status_code=404, detail="Prompt not found in this project")
+    
+    return prompt
+
+
+async def _update_prompt_impl(prompt_id: int, prompt_update: PromptUpdate, project_id: Optional[int]):
+    """Update a prompt and return it, 404 if missing or outside the project"""
+    # When scoped to a project, only update a prompt belonging to it
+    updated_prompt = await DatabaseManager.update_prompt(
+        prompt_id=prompt_id,
+        name=prompt_update.name,
+        status=prompt_update.status,
+        content=prompt_update.content,
+        project_id=prompt_update.project_id,
+        order_number=prompt_update.order_number,
+        within_project_id=project_id
+    )
+    if not updated_prompt:
+        raise HTTPException(status_code=404, detail=await _not_found_detail(prompt_id, project_id))
+    
+    return updated_prompt
+
+
+async def _delete_prompt_impl(prompt_id: int, project_id: Optional[int]):
+    """Delete a prompt, 404 if missing or outside the project"""
+    # When scoped to a project, only delete a prompt belonging to it
+    if not await DatabaseManager.delete_prompt(prompt_id, within_project_id=project_id):
+        raise HTTPException(status_code=404, detail=await _not_found_detail(prompt_id, project_id))
+    
+    return {"message": "Prompt deleted successfully"}
+
+
+async def _reorder_prompts_impl(prompt_ids: List[int], project_id: Optional[int]):
+    """Set order_number of the given prompts to their position in the list"""
+    existing_prompts = await DatabaseManager.get_prompts_by_ids(prompt_ids)
+    for prompt_id in prompt_ids:
+        # Check if prompt exists
+        existing_prompt = existing_prompts.get(prompt_id)
+        if not existing_prompt:
+            raise HTTPException(status_code=404, detail=f"Prompt {prompt_id} not found")
+        
+        # When scoped to a project, verify the prompt belongs to it
+        if project_id is not None and existing_prompt.get('project_id') != project_id:
+            raise HTTPException(status_code=404, detail=f"Prompt {prompt_id} not found in this project")
+    
+    try:
+        # Update the order_number of every prompt to reflect its new position
+        await DatabaseManager.bulk_update_order(
+            [(index + 1, prompt_id) for index, prompt_id in enumerate(prompt_ids)]
+        )
+        return {"message": "Prompts reordered successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reorder prompts: {str(e)}")
+
+
+@router.get("/api/{project_id}/prompts", response_model=None, responses={200: {"model": List[Prompt], "content": {"application/x-ndjson": {}}}})
 async def get_prompts(
+    request: Request,
     project_id: int,
-    status: Optional[str] = Query(None, description="Filter by status")
+    status: Optional[str] = Query(None, description="Filter by status"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of prompts to return"),
+    offset: int = Query(0, ge=0, description="Number of prompts to skip")
 ):
     """Get prompts for a specific project (project_id=0 means all projects)"""
-    # If project_id is 0, get all prompts
-    actual_project_id = None if project_id == 0 else project_id
-    prompts = await DatabaseManager.get_prompts(project_id=actual_project_id, status=status)
-    return prompts
+    return await _get_prompts_impl(request, _project_scope(project_id), status, limit, offset)
 
 
-@router.get("/api/prompts", response_model=List[Prompt])
+@router.get("/api/prompts", response_model=None, responses={200: {"model": List[Prompt], "content": {"application/x-ndjson": {}}}})
 async def get_prompts_legacy(
+    request: Request,
     project_id: Optional[int] = Query(None, description="Filter by project ID"),
-    status: Optional[str] = Query(None, description="Filter by status")
+    status: Optional[str] = Query(None, description="Filter by status"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of prompts to return"),
+    offset: int = Query(0, ge=0, description="Number of prompts to skip")
 ):
     """Legacy endpoint - Get all prompts, optionally filtered by project and status"""
-    prompts = await DatabaseManager.get_prompts(project_id=project_id, status=status)
-    return prompts
+    return await _get_prompts_impl(request, project_id, status, limit, offset)
 
 
 @router.post("/api/{project_id}/prompts", response_model=Prompt)
 async def create_prompt_for_project(project_id: int, prompt: PromptCreate):
     """Create a new prompt for a specific project"""
-    # Override the project_id from URL if it's not 0 (all projects)
-    actual_project_id = prompt.project_id if project_id == 0 else project_id
-    created_prompt = await DatabaseManager.create_prompt(
-        name=prompt.name,
-        status=prompt.status,
-        content=prompt.content,
-        project_id=actual_project_id
-    )
-    if not created_prompt:
-        raise HTTPException(status_code=500, detail="Failed to create prompt")
-    return created_prompt
+    return await _create_prompt_impl(prompt, _project_scope(project_id))
 
 
 @router.post("/api/prompts", response_model=Prompt)
 async def create_prompt(prompt: PromptCreate):
     """Legacy endpoint - Create a new prompt"""
-    created_prompt = await DatabaseManager.create_prompt(
-        name=prompt.name,
-        status=prompt.status,
-        content=prompt.content,
-        project_id=prompt.project_id
-    )
-    if not created_prompt:
-        raise HTTPException(status_code=500, detail="Failed to create prompt")
-    return created_prompt
+    return await _create_prompt_impl(prompt, None)
 
 
 @router.get("/api/{project_id}/prompt/{prompt_id}", response_model=Prompt)
 async def get_prompt_for_project(project_id: int, prompt_id: int):
     """Get a specific prompt by ID for a project"""
-    prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not prompt:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-    
-    # If project_id is not 0 (all projects), verify the prompt belongs to this project
-    if project_id != 0 and prompt.get('project_id') != project_id:
-        raise HTTPException(status_code=404, detail="Prompt not found in this project")
-    
-    return prompt
+    return await _get_prompt_impl(prompt_id, _project_scope(project_id))
 
 
 @router.get("/api/prompts/{prompt_id}", response_model=Prompt)
 async def get_prompt(prompt_id: int):
     """Legacy endpoint - Get a specific prompt by ID"""
-    prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not prompt:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-    return prompt
+    return await _get_prompt_impl(prompt_id, None)
 
 
 @router.put("/api/{project_id}/prompt/{prompt_id}", response_model=Prompt)
 async def update_prompt_for_project(project_id: int, prompt_id: int, prompt_update: PromptUpdate):
     """Update a prompt for a specific project"""
-    # Check if prompt exists
-    existing_prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not existing_prompt:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-    
-    # If project_id is not 0 (all projects), verify the prompt belongs to this project
-    if project_id != 0 and existing_prompt.get('project_id') != project_id:
-        raise HTTPException(status_code=404, detail="Prompt not found in this project")
-    
-    # Update the prompt
-    await DatabaseManager.update_prompt(
-        prompt_id=prompt_id,
-        name=prompt_update.name,
-        status=prompt_update.status,
-        content=prompt_update.content,
-        project_id=prompt_update.project_id,
-        order_number=prompt_update.order_number
-    )
-    
-    # Return the updated prompt with project information
-    updated_prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not updated_prompt:
-        raise HTTPException(status_code=500, detail="Failed to retrieve updated prompt")
-    
-    return updated_prompt
+    return await _update_prompt_impl(prompt_id, prompt_update, _project_scope(project_id))
 
 
 @router.put("/api/prompts/{prompt_id}", response_model=Prompt)
 async def update_prompt(prompt_id: int, prompt_update: PromptUpdate):
     """Legacy endpoint - Update a prompt"""
-    # Check if prompt exists
-    existing_prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not existing_prompt:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-    
-    # Update the prompt
-    await DatabaseManager.update_prompt(
-        prompt_id=prompt_id,
-        name=prompt_update.name,
-        status=prompt_update.status,
-        content=prompt_update.content,
-        project_id=prompt_update.project_id,
-        order_number=prompt_update.order_number
-    )
-    
-    # Return the updated prompt with project information
-    updated_prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not updated_prompt:
-        raise HTTPException(status_code=500, detail="Failed to retrieve updated prompt")
-    
-    return updated_prompt
+    return await _update_prompt_impl(prompt_id, prompt_update, None)
 
 
 @router.delete("/api/{project_id}/prompt/{prompt_id}")
 async def delete_prompt_for_project(project_id: int, prompt_id: int):
     """Delete a prompt for a specific project"""
-    # Check if prompt exists
-    existing_prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not existing_prompt:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-    
-    # If project_id is not 0 (all projects), verify the prompt belongs to this project
-    if project_id != 0 and existing_prompt.get('project_id') != project_id:
-        raise HTTPException(status_code=404, detail="Prompt not found in this project")
-    
-    await DatabaseManager.delete_prompt(prompt_id)
-    return {"message": "Prompt deleted successfully"}
+    return await _delete_prompt_impl(prompt_id, _project_scope(project_id))
 
 
 @router.delete("/api/prompts/{prompt_id}")
 async def delete_prompt(prompt_id: int):
     """Legacy endpoint - Delete a prompt"""
-    # Check if prompt exists
-    existing_prompt = await DatabaseManager.get_prompt(prompt_id)
-    if not existing_prompt:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-    
-    await DatabaseManager.delete_prompt(prompt_id)
-    return {"message": "Prompt deleted successfully"}
+    return await _delete_prompt_impl(prompt_id, None)
 
 
 @router.post("/api/{project_id}/prompts/reorder")
 async def reorder_prompts_for_project(project_id: int, request: PromptReorderRequest):
     """Reorder prompts for a specific project by updating their order_number field"""
-    try:
-        for index, prompt_id in enumerate(request.prompt_ids):
-            # Check if prompt exists
-            existing_prompt = await DatabaseManager.get_prompt(prompt_id)
-            if not existing_prompt:
-                raise HTTPException(status_code=404, detail=f"Prompt {prompt_id} not found")
-            
-            # If project_id is not 0 (all projects), verify the prompt belongs to this project
-            if project_id != 0 and existing_prompt.get('project_id') != project_id:
-                raise HTTPException(status_code=404, detail=f"Prompt {prompt_id} not found in this project")
-            
-            # Update the order_number to reflect the new position
-            await DatabaseManager.update_prompt(
-                prompt_id=prompt_id,
-                order_number=index + 1
-            )
-        
-        return {"message": "Prompts reordered successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to reorder prompts: {str(e)}")
+    return await _reorder_prompts_impl(request.prompt_ids, _project_scope(project_id))
 
 
 @router.post("/api/prompts/reorder")
 async def reorder_prompts(request: PromptReorderRequest):
     """Legacy endpoint - Reorder prompts by updating their order_number field"""
-    try:
-        for index, prompt_id in enumerate(request.prompt_ids):
-            # Check if prompt exists
-            existing_prompt = await DatabaseManager.get_prompt(prompt_id)
-            if not existing_prompt:
-                raise HTTPException(status_code=404, detail=f"Prompt {prompt_id} not found")
-            
-            # Update the order_number to reflect the new position
-            await DatabaseManager.update_prompt(
-                prompt_id=prompt_id,
-                order_number=index + 1
-            )
-        
-        return {"message": "Prompts reordered successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to reorder prompts: {str(e)}")
\ No newline at end of file
+    return await _reorder_prompts_impl(request.prompt_ids, None)
\ No newline at end of file
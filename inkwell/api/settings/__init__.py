@@ -0,0 +1 @@
+"""Settings API package"""
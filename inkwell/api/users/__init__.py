@@ -0,0 +1 @@
+"""Users API package"""
@@ -0,0 +1,251 @@
+"""In-memory cache of the React build's static assets"""
+
+import functools
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Files above this size are left on disk and served with FileResponse
+MAX_CACHED_FILE_SIZE = 4 * 1024 * 1024
+
+# Build files outside static/ below this size are served from memory too
+SMALL_FILE_SIZE = 256 * 1024
+
+# Build assets have content-hashed names, so a given URL never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Media types for the extensions a React build produces, so serving a file
+# doesn't go through mimetypes (text types get their charset from Starlette)
+EXT_TO_MIME = {
+    "js": "text/javascript",
+    "css": "text/css",
+    "html": "text/html",
+    "json": "application/json",
+    "map": "application/json",
+    "txt": "text/plain",
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "gif": "image/gif",
+    "ico": "image/vnd.microsoft.icon",
+    "woff": "font/woff",
+    "woff2": "font/woff2",
+}
+
+# Precompressed siblings written by the build (e.g. main.js.br next to main.js)
+PRECOMPRESSED_SUFFIXES = (".br", ".gz")
+
+# Files without a build-written sibling are compressed while the server starts
+# (in every worker), so use levels that are fast yet close to the maximum
+RUNTIME_GZIP_LEVEL = 6
+RUNTIME_BROTLI_QUALITY = 5
+
+# Non-text media types worth compressing; images, fonts and the like are
+# already compressed
+COMPRESSIBLE_MEDIA_TYPES = frozenset({
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "image/vnd.microsoft.icon",
+})
+
+# One coding in an Accept-Encoding header, with its optional quality value
+_ACCEPT_ENCODING_RE = re.compile(r"([a-z0-9*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?", re.IGNORECASE)
+
+
+class Asset(NamedTuple):
+    """A static file held in memory, with precompressed variants"""
+    body: bytes
+    gzip_body: Optional[bytes]
+    brotli_body: Optional[bytes]
+    etag: str
+    media_type: str
+    last_modified: str
+
+
+def _compressed(path: Path, suffix: str, body: bytes, compress) -> Optional[bytes]:
+    """
+    Return the compressed variant of body: the precompressed sibling file
+    when the build wrote one, else body compressed now (unless compress is
+    None). Either way it is kept only if it is actually smaller.
+    """
+    sibling = path.with_name(path.name + suffix)
+    if sibling.is_file():
+        compressed = sibling.read_bytes()
+    elif compress is not None:
+        compressed = compress(body)
+    else:
+        return None
+    return compressed if len(compressed) < len(body) else None
+
+
+def _is_compressible(path: Path, media_type: str) -> bool:
+    """Whether a file is worth compressing at startup (source maps are only fetched by devtools)"""
+    if path.suffix == ".map":
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+def _is_precompressed_sibling(path: Path) -> bool:
+    """Whether path is a .br/.gz copy of another file in the same directory"""
+    return path.suffix in PRECOMPRESSED_SUFFIXES and path.with_suffix("").is_file()
+
+
+@functools.lru_cache(maxsize=64)
+def accepted_encodings(accept_encoding: str) -> FrozenSet[str]:
+    """Parse an Accept-Encoding header into the codings the client accepts (q > 0)"""
+    accepted = set()
+    for coding, quality in _ACCEPT_ENCODING_RE.findall(accept_encoding):
+        try:
+            if quality and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.lower())
+    return frozenset(accepted)
+
+
+def media_type_for(file_path: str) -> str:
+    """Return the media type for a file name, from EXT_TO_MIME when the extension is known"""
+    media_type = EXT_TO_MIME.get(file_path.rpartition(".")[2].lower())
+    if media_type is None:
+        media_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    return media_type
+
+
+def safe_rel(file_path: str) -> Optional[str]:
+    """Return file_path if it is a plain relative path, None if it could escape its directory"""
+    if file_path.startswith("/") or "\\" in file_path or "\0" in file_path or ".." in file_path.split("/"):
+        return None
+    return file_path
+
+
+def list_files(directory: Path) -> FrozenSet[str]:
+    """Return the POSIX paths, relative to directory, of every file under it"""
+    return frozenset(
+        (Path(root) / name).relative_to(directory).as_posix()
+        for root, _, files in os.walk(directory)
+        for name in files
+    )
+
+
+def load_asset(path: Path) -> Asset:
+    """Read a file into memory along with its compressed variants, ETag and mimetype"""
+    body = path.read_bytes()
+    mtime = path.stat().st_mtime
+    media_type = media_type_for(path.name)
+    compressible = _is_compressible(path, media_type)
+    return Asset(
+        body=body,
+        gzip_body=_compressed(
+            path, ".gz", body,
+            (lambda data: gzip.compress(data, RUNTIME_GZIP_LEVEL)) if compressible else None
+        ),
+        brotli_body=_compressed(
+            path, ".br", body,
+            (lambda data: brotli.compress(data, quality=RUNTIME_BROTLI_QUALITY)) if compressible and brotli else None
+        ),
+        etag='"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+        media_type=media_type,
+        last_modified=formatdate(mtime, usegmt=True)
+    )
+
+
+def load_assets(directory: Path) -> Dict[str, Asset]:
+    """
+    Read every file under directory into memory, keyed by its POSIX path
+    relative to it. Precompressed siblings are folded into the file they
+    compress rather than cached on their own.
+    """
+    assets = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = Path(root) / name
+            if _is_precompressed_sibling(path):
+                continue
+            if path.stat().st_size <= MAX_CACHED_FILE_SIZE:
+                assets[path.relative_to(directory).as_posix()] = load_asset(path)
+    return assets
+
+
+def asset_response(request: Request, asset: Asset, cache_control: str = IMMUTABLE_CACHE_CONTROL) -> Response:
+    """Serve a cached asset: 304 if the client's copy is current, else the best encoding it accepts"""
+    headers = {
+        "ETag": asset.etag,
+        "Last-Modified": asset.last_modified,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding"
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and asset.etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    # Prefer br, then gzip, then the identity body
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    body = asset.body
+    if asset.brotli_body is not None and "br" in accepted:
+        body = asset.brotli_body
+        headers["Content-Encoding"] = "br"
+    elif asset.gzip_body is not None and "gzip" in accepted:
+        body = asset.gzip_body
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(content=body, media_type=asset.media_type, headers=headers)
+
+
+class FrontendDispatchMiddleware:
+    """
+    ASGI middleware that answers GET/HEAD requests for the frontend before
+    the router sees them: cached assets are found by URL path in one dict
+    lookup, and any other path outside the passthrough prefixes is a
+    client-side route that gets the index asset. Everything else (the API,
+    the docs, files served from disk) goes on to the app.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        assets: Dict[str, Tuple[Asset, str]],
+        index: Optional[Asset],
+        passthrough_prefixes: Tuple[str, ...],
+        passthrough_paths: FrozenSet[str]
+    ):
+        self.app = app
+        # URL path -> (asset, Cache-Control)
+        self.assets = assets
+        self.index = index
+        self.passthrough_prefixes = passthrough_prefixes
+        self.passthrough_paths = passthrough_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            path = scope["path"]
+            entry = self.assets.get(path)
+            if (
+                entry is None
+                and self.index is not None
+                and not path.startswith(self.passthrough_prefixes)
+                and path not in self.passthrough_paths
+                and safe_rel(path[1:]) is not None
+            ):
+                entry = (self.index, "no-cache")
+            if entry is not None:
+                asset, cache_control = entry
+                response = asset_response(Request(scope), asset, cache_control=cache_control)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
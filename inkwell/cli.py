@@ -6,9 +6,7 @@ import subprocess
 import webbrowser
 from pathlib import Path
 import click
-import uvicorn
 from .config import config
-from .database import init_database
 
 
 @click.group()
@@ -23,6 +21,9 @@ def main():
 @click.option('--no-browser', is_flag=True, help='Don\'t open browser automatically')
 def start(dev, no_browser):
     """Start the Inkwell application"""
+    import uvicorn
+    from .database import init_database
+
     click.echo("Starting Inkwell...")
     
     # Initialize database
@@ -56,14 +57,29 @@ def start(dev, no_browser):
             # Open the production URL (served by FastAPI)
             webbrowser.open(config.backend_url)
     
-    # Start the FastAPI server
-    from .server import app
+    # The development frontend runs on its own origin
+    if dev:
+        os.environ['INKWELL_ENABLE_CORS'] = '1'
+        config.enable_cors = True
+
+    # Start the FastAPI server. uvicorn imports the app itself (in the worker
+    # processes), so this process never loads the server or its assets
+    options = config.uvicorn_options()
+    
+    # Warn rather than fail when a platform lacks uvloop or httptools
+    if (options["loop"], options["http"]) != ("uvloop", "httptools"):
+        click.echo(f"Warning: running with the {options['loop']} event loop and {options['http']} parser - "
+                   "install uvicorn[standard] for uvloop and httptools")
+    
+    # The reloader runs a single worker
+    if dev:
+        options["workers"] = None
+    
     uvicorn.run(
         "inkwell.server:app",
-        host=config.host,
-        port=config.backend_port,
         reload=dev,
-        access_log=dev
+        access_log=dev,
+        **options
     )
 
 
@@ -92,6 +108,8 @@ def status():
 @main.command()
 def init():
     """Initialize Inkwell configuration and database"""
+    from .database import init_database
+
     click.echo("Initializing Inkwell...")
     
     # Create config directory
@@ -1,40 +1,53 @@
 #!/usr/bin/env python3
 """Inkwell CLI - Command line interface for Inkwell prompt management"""
 
-import asyncio
+# asyncio, aiohttp and orjson are imported where they're used, so --help and
+# argument errors don't pay for loading them
 import click
-import aiohttp
-import json
+import hashlib
+import time
+from functools import cached_property
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 # Default configuration
 DEFAULT_BASE_URL = "http://localhost:7893"
 CONFIG_FILE = Path.home() / ".inkwell" / "cli_config.json"
+CACHE_DIR = Path.home() / ".inkwell" / "cli_cache"
+# Bounds on the response cache: entries beyond the most recently used ones,
+# or unused for longer than the maximum age, are removed after each write
+MAX_CACHE_ENTRIES = 64
+MAX_CACHE_AGE = 7 * 24 * 60 * 60
 
 
 class InkwellConfig:
     """Configuration management for Inkwell CLI"""
     
-    def __init__(self):
-        self.base_url = DEFAULT_BASE_URL
-        self.load_config()
+    @cached_property
+    def base_url(self) -> str:
+        """Base URL from the config file, read on first access only"""
+        return self.load_config()
     
-    def load_config(self):
-        """Load configuration from file"""
+    def load_config(self) -> str:
+        """Load configuration from file, returning the base URL"""
         if CONFIG_FILE.exists():
+            import orjson
+            
             try:
-                with open(CONFIG_FILE) as f:
-                    config = json.load(f)
-                    self.base_url = config.get('base_url', DEFAULT_BASE_URL)
-            except (json.JSONDecodeError, IOError):
+                with open(CONFIG_FILE, 'rb') as f:
+                    config = orjson.loads(f.read())
+                    return config.get('base_url', DEFAULT_BASE_URL)
+            except (orjson.JSONDecodeError, IOError):
                 pass  # Use defaults if config is invalid
+        return DEFAULT_BASE_URL
     
     def save_config(self):
         """Save configuration to file"""
+        import orjson
+        
         CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump({'base_url': self.base_url}, f, indent=2)
+        with open(CONFIG_FILE, 'wb') as f:
+            f.write(orjson.dumps({'base_url': self.base_url}, option=orjson.OPT_INDENT_2))
 
 
 config = InkwellConfig()
@@ -44,22 +57,62 @@ class InkwellAPI:
     """API client for Inkwell CLI"""
     
     def __init__(self, base_url: str = None):
-        self.base_url = base_url or config.base_url
+        self._base_url = base_url
+        self._session = None
+    
+    @property
+    def base_url(self) -> str:
+        """Server base URL, falling back to the configured one"""
+        return self._base_url or config.base_url
+    
+    async def __aenter__(self):
+        """Open one HTTP session whose keep-alive connections are reused by every request"""
+        import aiohttp
+        
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the HTTP session and its pooled connections"""
+        await self._session.close()
+        self._session = None
     
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[Any, Any]:
         """Make HTTP request to Inkwell API"""
+        # Outside an `async with` block, open a session just for this request
+        if self._session is None:
+            async with self:
+                return await self._make_request(method, endpoint, **kwargs)
+        
+        import aiohttp
+        import orjson
+        
         url = f"{self.base_url}{endpoint}"
         
+        # For GETs, revalidate a cached response instead of downloading it again
+        cache_file = _cache_file(url, kwargs.get('params')) if method == "GET" else None
+        cached = _read_cache(cache_file) if cache_file else None
+        if cached:
+            kwargs['headers'] = {**kwargs.get('headers', {}), 'If-None-Match': cached['etag']}
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.request(method, url, **kwargs) as response:
-                    if response.status == 404:
-                        raise click.ClickException(f"Not found: {endpoint}")
-                    elif response.status >= 400:
-                        error_text = await response.text()
-                        raise click.ClickException(f"API Error {response.status}: {error_text}")
-                    
-                    return await response.json()
+            async with self._session.request(method, url, **kwargs) as response:
+                if response.status == 304 and cached:
+                    _touch_cache(cache_file)
+                    return cached['body']
+                elif response.status == 404:
+                    raise click.ClickException(f"Not found: {endpoint}")
+                elif response.status >= 400:
+                    error_text = await response.text()
+                    raise click.ClickException(f"API Error {response.status}: {error_text}")
+                
+                body = orjson.loads(await response.read())
+                etag = response.headers.get('ETag')
+                if cache_file and etag:
+                    _write_cache(cache_file, etag, body)
+                return body
         except aiohttp.ClientError as e:
             raise click.ClickException(f"Connection error: {e}. Is the Inkwell server running at {self.base_url}?")
     
@@ -67,13 +120,18 @@ class InkwellAPI:
         """Get all projects"""
         return await self._make_request("GET", "/api/projects")
     
-    async def get_prompts(self, project_id: Optional[int] = None, status: Optional[str] = None) -> List[Dict[Any, Any]]:
-        """Get prompts, optionally filtered by project and status"""
+    async def get_prompts(self, project_id: Optional[int] = None, status: Optional[str] = None,
+                          limit: Optional[int] = None, offset: int = 0) -> List[Dict[Any, Any]]:
+        """Get prompts, optionally filtered by project and status and paged by limit/offset"""
         params = {}
         if project_id is not None:
             params['project_id'] = project_id
         if status is not None:
             params['status'] = status
+        if limit is not None:
+            params['limit'] = limit
+        if offset:
+            params['offset'] = offset
         
         return await self._make_request("GET", "/api/prompts", params=params)
     
@@ -87,8 +145,81 @@ class InkwellAPI:
         return await self._make_request("PUT", f"/api/prompts/{prompt_id}", json=data)
 
 
+def _cache_file(url: str, params: Optional[Dict[str, Any]]) -> Path:
+    """Cache file for a GET request, named after a hash of its URL and query parameters"""
+    key = url + "?" + "&".join(f"{name}={value}" for name, value in sorted((params or {}).items()))
+    return CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
+def _read_cache(cache_file: Path) -> Optional[Dict[str, Any]]:
+    """Load a cached {'etag', 'body'} response, or None if there isn't a usable one"""
+    import orjson
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, IOError):
+        return None
+
+
+def _write_cache(cache_file: Path, etag: str, body: Any):
+    """Store a response body with its ETag for the next conditional request"""
+    import orjson
+    
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            f.write(orjson.dumps({'etag': etag, 'body': body}))
+    except IOError:
+        return  # Caching is best-effort
+    _prune_cache()
+
+
+def _touch_cache(cache_file: Path):
+    """Mark a cache entry as recently used, so pruning keeps it"""
+    try:
+        cache_file.touch()
+    except IOError:
+        pass
+
+
+def _prune_cache():
+    """Remove cache entries that are too old or beyond MAX_CACHE_ENTRIES, oldest first"""
+    try:
+        entries = []
+        for entry in CACHE_DIR.glob('*.json'):
+            entries.append((entry.stat().st_mtime, entry))
+    except IOError:
+        return
+    
+    entries.sort(reverse=True)
+    cutoff = time.time() - MAX_CACHE_AGE
+    for index, (mtime, entry) in enumerate(entries):
+        if index >= MAX_CACHE_ENTRIES or mtime < cutoff:
+            try:
+                entry.unlink()
+            except IOError:
+                pass
+
+
+def to_json(data) -> bytes:
+    """Format data as indented JSON bytes, which click.echo writes straight to binary stdout"""
+    import orjson
+    
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+
 def run_async(coro):
     """Run an async coroutine in a sync context"""
+    import asyncio
+    
+    # Use uvloop's faster event loop when it's available (not on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     return asyncio.run(coro)
 
 
@@ -149,22 +280,24 @@ def projects_list(ctx, output_format):
       inkwell-cli projects list --format=json
     """
     async def _list_projects():
-        api = ctx.obj['api']
-        projects = await api.get_projects()
-        
-        if output_format == 'json':
-            click.echo(json.dumps(projects, indent=2))
-        else:
-            if not projects:
-                click.echo("No projects found.")
-                return
+        async with ctx.obj['api'] as api:
+            projects = await api.get_projects()
             
-            # Table format
-            click.echo(f"{'ID':<4} {'Name':<30} {'Created':<20}")
-            click.echo("-" * 54)
-            for project in projects:
-                created = project['created_at'][:10]  # Just the date part
-                click.echo(f"{project['id']:<4} {project['name']:<30} {created:<20}")
+            if output_format == 'json':
+                click.echo(to_json(projects))
+            else:
+                if not projects:
+                    click.echo("No projects found.")
+                    return
+                
+                # Table format - built up front and written in one go
+                lines = [f"{'ID':<4} {'Name':<30} {'Created':<20}", "-" * 54]
+                lines.extend(
+                    # Just the date part of created_at
+                    f"{project['id']:<4} {project['name']:<30} {project['created_at'][:10]:<20}"
+                    for project in projects
+                )
+                click.echo("\n".join(lines))
     
     run_async(_list_projects())
 
@@ -175,8 +308,10 @@ def projects_list(ctx, output_format):
 @click.option('--format', 'output_format', default='table', type=click.Choice(['table', 'json']), 
               help='Output format')
 @click.option('--all-status', is_flag=True, help='Show prompts with all statuses')
+@click.option('--limit', type=click.IntRange(min=1), help='Show at most this many prompts')
+@click.option('--offset', default=0, type=click.IntRange(min=0), help='Skip this many prompts first')
 @click.pass_context
-def prompts_list(ctx, project_id, status, output_format, all_status):
+def prompts_list(ctx, project_id, status, output_format, all_status, limit, offset):
     """List prompts
     
     Shows prompts, by default filtered to 'draft' status only.
@@ -188,31 +323,32 @@ def prompts_list(ctx, project_id, status, output_format, all_status):
       inkwell-cli prompts list --all-status
       inkwell-cli prompts list --project=1
       inkwell-cli prompts list --format=json
+      inkwell-cli prompts list --limit=20 --offset=40
     """
     async def _list_prompts():
-        api = ctx.obj['api']
-        
-        # If all-status is set, don't filter by status
-        status_filter = None if all_status else status
-        
-        prompts = await api.get_prompts(project_id=project_id, status=status_filter)
-        
-        if output_format == 'json':
-            click.echo(json.dumps(prompts, indent=2))
-        else:
-            if not prompts:
-                filter_desc = f"status='{status_filter}'" if status_filter else "any status"
-                if project_id:
-                    filter_desc += f", project={project_id}"
-                click.echo(f"No prompts found with {filter_desc}.")
-                return
+        async with ctx.obj['api'] as api:
+            # If all-status is set, don't filter by status
+            status_filter = None if all_status else status
+            
+            prompts = await api.get_prompts(project_id=project_id, status=status_filter, limit=limit, offset=offset)
             
-            # Table format - show name only as requested
-            click.echo(f"{'ID':<4} {'Name':<40} {'Status':<10} {'Project':<20}")
-            click.echo("-" * 74)
-            for prompt in prompts:
-                project_name = prompt.get('project_name', 'None')
-                click.echo(f"{prompt['id']:<4} {prompt['name']:<40} {prompt['status']:<10} {project_name:<20}")
+            if output_format == 'json':
+                click.echo(to_json(prompts))
+            else:
+                if not prompts:
+                    filter_desc = f"status='{status_filter}'" if status_filter else "any status"
+                    if project_id:
+                        filter_desc += f", project={project_id}"
+                    click.echo(f"No prompts found with {filter_desc}.")
+                    return
+                
+                # Table format - show name only as requested, written in one go
+                lines = [f"{'ID':<4} {'Name':<40} {'Status':<10} {'Project':<20}", "-" * 74]
+                lines.extend(
+                    f"{prompt['id']:<4} {prompt['name']:<40} {prompt['status']:<10} {prompt.get('project_name', 'None'):<20}"
+                    for prompt in prompts
+                )
+                click.echo("\n".join(lines))
     
     run_async(_list_prompts())
 
@@ -232,60 +368,88 @@ def prompts_get(ctx, prompt_id, output_format):
       inkwell-cli prompts get 123 --format=json
     """
     async def _get_prompt():
-        api = ctx.obj['api']
-        prompt = await api.get_prompt(prompt_id)
-        
-        if output_format == 'json':
-            click.echo(json.dumps(prompt, indent=2))
-        else:
-            # Detailed format
-            click.echo(f"Prompt Details:")
-            click.echo(f"  ID: {prompt['id']}")
-            click.echo(f"  Name: {prompt['name']}")
-            click.echo(f"  Status: {prompt['status']}")
-            click.echo(f"  Project: {prompt.get('project_name', 'None')} (ID: {prompt.get('project_id', 'None')})")
-            click.echo(f"  Created: {prompt['created_at']}")
-            click.echo(f"  Updated: {prompt['updated_at']}")
+        async with ctx.obj['api'] as api:
+            prompt = await api.get_prompt(prompt_id)
             
-            if prompt.get('content'):
-                click.echo(f"  Content:")
-                click.echo(f"    {prompt['content'][:200]}{'...' if len(prompt['content']) > 200 else ''}")
+            if output_format == 'json':
+                click.echo(to_json(prompt))
             else:
-                click.echo(f"  Content: (empty)")
+                # Detailed format
+                click.echo(f"Prompt Details:")
+                click.echo(f"  ID: {prompt['id']}")
+                click.echo(f"  Name: {prompt['name']}")
+                click.echo(f"  Status: {prompt['status']}")
+                click.echo(f"  Project: {prompt.get('project_name', 'None')} (ID: {prompt.get('project_id', 'None')})")
+                click.echo(f"  Created: {prompt['created_at']}")
+                click.echo(f"  Updated: {prompt['updated_at']}")
+                
+                if prompt.get('content'):
+                    click.echo(f"  Content:")
+                    click.echo(f"    {prompt['content'][:200]}{'...' if len(prompt['content']) > 200 else ''}")
+                else:
+                    click.echo(f"  Content: (empty)")
     
     run_async(_get_prompt())
 
 
 @prompts.command('set-status')
-@click.argument('prompt_id', type=int)
+@click.argument('prompt_ids', type=int, nargs=-1, required=True)
 @click.argument('status', type=click.Choice(['draft', 'active', 'archived']))
 @click.option('--format', 'output_format', default='detailed', type=click.Choice(['detailed', 'json']), 
               help='Output format')
 @click.pass_context
-def prompts_set_status(ctx, prompt_id, status, output_format):
+def prompts_set_status(ctx, prompt_ids, status, output_format):
     """Set prompt status
     
-    Updates the status of a specific prompt.
+    Updates the status of one or more prompts.
     
     Valid statuses: draft, active, archived
     
     Examples:
       inkwell-cli prompts set-status 123 active
       inkwell-cli prompts set-status 123 archived
+      inkwell-cli prompts set-status 123 124 125 archived
     """
     async def _set_status():
-        api = ctx.obj['api']
-        prompt = await api.update_prompt_status(prompt_id, status)
-        
-        if output_format == 'json':
-            click.echo(json.dumps(prompt, indent=2))
-        else:
-            click.echo(f"✓ Updated prompt {prompt_id} status to '{status}'")
-            click.echo(f"  Name: {prompt['name']}")
-            click.echo(f"  Project: {prompt.get('project_name', 'None')}")
+        async with ctx.obj['api'] as api:
+            import asyncio
+            
+            # Send the updates concurrently rather than one after another; a
+            # failed update doesn't stop the others from being reported
+            results = await asyncio.gather(
+                *(api.update_prompt_status(prompt_id, status) for prompt_id in prompt_ids),
+                return_exceptions=True
+            )
+            
+            # A single ID keeps the original output, including its error
+            if len(results) == 1 and isinstance(results[0], BaseException):
+                raise results[0]
+            
+            updated = [result for result in results if not isinstance(result, BaseException)]
+            failed = [
+                (prompt_id, result) for prompt_id, result in zip(prompt_ids, results)
+                if isinstance(result, BaseException)
+            ]
+            
+            if output_format == 'json':
+                # A single ID keeps the original single-object output
+                click.echo(to_json(updated[0] if len(prompt_ids) == 1 else updated))
+            else:
+                for prompt_id, result in zip(prompt_ids, results):
+                    if isinstance(result, BaseException):
+                        continue
+                    click.echo(f"✓ Updated prompt {prompt_id} status to '{status}'")
+                    click.echo(f"  Name: {result['name']}")
+                    click.echo(f"  Project: {result.get('project_name', 'None')}")
+            
+            # Report every failure, then exit non-zero
+            for prompt_id, error in failed:
+                message = error.format_message() if isinstance(error, click.ClickException) else str(error)
+                click.echo(f"✗ Failed to update prompt {prompt_id}: {message}", err=True)
+            if failed:
+                raise click.ClickException(f"{len(failed)} of {len(prompt_ids)} updates failed")
     
     run_async(_set_status())
 
-
 if __name__ == '__main__':
     cli()
\ No newline at end of file
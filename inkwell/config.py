@@ -1,5 +1,6 @@
 """Configuration management for Inkwell"""
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -25,6 +26,21 @@ class InkwellConfig:
         self.frontend_dev_port = 7892
         self.host = "127.0.0.1"
         
+        # uvicorn worker processes (one per core is a reasonable ceiling; each
+        # holds its own database connection), listen backlog, and the number of
+        # concurrent connections per worker before new ones get a 503
+        self.workers = int(os.getenv('INKWELL_WORKERS', '1'))
+        self.backlog = int(os.getenv('INKWELL_BACKLOG', '2048'))
+        self.limit_concurrency = int(os.getenv('INKWELL_LIMIT_CONCURRENCY', '0')) or None
+        
+        # Serve the React build from the backend; set INKWELL_SERVE_FRONTEND=0
+        # when a reverse proxy serves it instead
+        self.serve_frontend = os.getenv('INKWELL_SERVE_FRONTEND', '1') != '0'
+        
+        # Add CORS headers even when the backend serves the frontend itself
+        # (same origin); without a served build they are always on
+        self.enable_cors = bool(os.getenv('INKWELL_ENABLE_CORS'))
+        
     def ensure_inkwell_directory(self):
         """Ensure the ~/.inkwell directory exists"""
         self.inkwell_dir.mkdir(exist_ok=True)
@@ -44,6 +60,22 @@ class InkwellConfig:
     def frontend_dev_url(self):
         """Get the frontend development server URL"""
         return f"http://{self.host}:{self.frontend_dev_port}"
+    
+    def uvicorn_options(self):
+        """
+        Get uvicorn settings for serving the app: host, port, workers, backlog
+        and concurrency limit, plus uvloop and httptools (both from
+        uvicorn[standard]) when installed.
+        """
+        return {
+            "host": self.host,
+            "port": self.backend_port,
+            "workers": self.workers,
+            "backlog": self.backlog,
+            "limit_concurrency": self.limit_concurrency,
+            "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+            "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        }
 
 
 config = InkwellConfig()
\ No newline at end of file
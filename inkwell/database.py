@@ -1,10 +1,69 @@
 """SQLite database management for Inkwell"""
 
+import asyncio
 import sqlite3
 import aiosqlite
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 from .config import config
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows
+    fcntl = None
+
+# Tables whose changes are counted in table_versions
+VERSIONED_TABLES = ('projects', 'prompts')
+
+# Bump whenever init_database changes the schema, so existing databases re-run it
+SCHEMA_VERSION = 2
+
+# Per-connection tuning: WAL makes synchronous=NORMAL safe, the rest keep temp
+# tables, recently used pages (64 MiB) and a 256 MiB file mapping in memory
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _has_column(cursor, table: str, column: str) -> bool:
+    """Check whether a table already has a column"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in cursor.fetchall())
+
+
+def _schema_version(db_path: Path):
+    """Read the schema_version setting without writing to the database (None if unavailable)"""
+    try:
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM settings WHERE key = 'schema_version'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # No settings table yet, or the file isn't readable as a database
+        return None
+    return row[0] if row else None
+
+
+def _schema_is_current(db_path: Path) -> bool:
+    """Check whether the database was already set up by this schema version"""
+    return db_path.exists() and _schema_version(db_path) == str(SCHEMA_VERSION)
+
+
+@contextmanager
+def _init_lock(db_path: Path):
+    """Hold an exclusive file lock next to the database (a no-op where fcntl is unavailable)"""
+    if fcntl is None:
+        yield
+        return
+    with open(db_path.with_name(db_path.name + ".init.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
 
 def init_database():
     """Initialize the SQLite database with required tables"""
@@ -12,9 +71,34 @@ def init_database():
     db_path = Path(config.database_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
     
-    conn = sqlite3.connect(config.database_path)
+    # Nothing to do if the database was already set up by this schema version
+    if _schema_is_current(db_path):
+        return config.database_path
+    
+    # With several workers starting at once, only one sets the schema up;
+    # the others find it current once they get the lock
+    with _init_lock(db_path):
+        if not _schema_is_current(db_path):
+            _create_schema()
+    
+    return config.database_path
+
+
+def _create_schema():
+    """Create the tables, indexes and triggers, migrating an older schema in place"""
+    # Autocommit mode, so the transaction below is managed explicitly
+    conn = sqlite3.connect(config.database_path, isolation_level=None)
     cursor = conn.cursor()
     
+    # WAL lets readers proceed while a write is in progress; it is stored in
+    # the database file, so every later connection uses it too
+    cursor.execute("PRAGMA journal_mode=WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        cursor.execute(pragma)
+    
+    # Run the whole schema setup as one transaction - one commit instead of one per statement
+    cursor.execute("BEGIN IMMEDIATE")
+    
     # Create example table - you can modify this based on your needs
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS items (
@@ -43,11 +127,8 @@ def init_database():
     ''')
     
     # Add whiteboard column to existing projects table (migration)
-    try:
+    if not _has_column(cursor, 'projects', 'whiteboard'):
         cursor.execute("ALTER TABLE projects ADD COLUMN whiteboard TEXT DEFAULT ''")
-    except sqlite3.OperationalError:
-        # Column already exists, ignore
-        pass
     
     # Create prompts table
     cursor.execute('''
@@ -65,11 +146,22 @@ def init_database():
     ''')
     
     # Add order_number column to existing prompts table (migration)
-    try:
+    if not _has_column(cursor, 'prompts', 'order_number'):
         cursor.execute("ALTER TABLE prompts ADD COLUMN order_number INTEGER DEFAULT 0")
-    except sqlite3.OperationalError:
-        # Column already exists, ignore
-        pass
+    
+    # Indexes for the prompt list filters (project_id, status) and its
+    # order_number/created_at sort; project_id alone serves project deletion
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_prompts_status_order
+        ON prompts (status, order_number, created_at DESC)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_prompts_project_status_order
+        ON prompts (project_id, status, order_number, created_at DESC)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_prompts_project ON prompts (project_id)
+    ''')
     
     # Migrate existing prompts with text project to use project_id
     cursor.execute('''
@@ -97,33 +189,226 @@ def init_database():
         INSERT OR IGNORE INTO settings (key, value) VALUES ('initialized', 'true')
     ''')
     
-    conn.commit()
+    # A random ID for this database, part of every list ETag: the change
+    # counters below restart at 0 in a recreated database, the ID doesn't repeat
+    cursor.execute('''
+        INSERT OR IGNORE INTO settings (key, value) VALUES ('database_id', lower(hex(randomblob(8))))
+    ''')
+    
+    # Create table_versions table - a change counter per table, used for ETags
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    # Bump the counter on every write to a versioned table
+    for table in VERSIONED_TABLES:
+        cursor.execute("INSERT OR IGNORE INTO table_versions (name) VALUES (?)", (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            ''')
+    
+    # Refresh planner statistics so the indexes above get picked
+    cursor.execute("ANALYZE")
+    
+    # Record the schema version so later starts can skip all of the above
+    cursor.execute(
+        "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES ('schema_version', ?, CURRENT_TIMESTAMP)",
+        (str(SCHEMA_VERSION),)
+    )
+    
+    cursor.execute("COMMIT")
     conn.close()
+
+
+# Hot-path queries. sqlite3 caches prepared statements per connection keyed
+# by SQL text, so always passing these exact strings on the shared connection
+# skips re-parsing them.
+SELECT_PROMPTS = """
+    SELECT p.*, proj.name as project_name 
+    FROM prompts p 
+    LEFT JOIN projects proj ON p.project_id = proj.id
+"""
+SELECT_PROMPT_BY_ID = SELECT_PROMPTS + " WHERE p.id = ?"
+SELECT_PROJECT_BY_ID = "SELECT * FROM projects WHERE id = ?"
+SELECT_TABLE_VERSIONS = """
+    SELECT name, version FROM table_versions
+    UNION ALL SELECT key, value FROM settings WHERE key = 'database_id'
+"""
+SELECT_PROJECTS = "SELECT * FROM projects ORDER BY name"
+SELECT_LAST_PROJECT = "SELECT * FROM projects WHERE rowid = last_insert_rowid()"
+SELECT_ITEMS = "SELECT * FROM items ORDER BY created_at DESC"
+SELECT_ITEM_BY_ID = "SELECT * FROM items WHERE id = ?"
+SELECT_LAST_ITEM = "SELECT * FROM items WHERE rowid = last_insert_rowid()"
+SELECT_SETTING = "SELECT value FROM settings WHERE key = ?"
+UPSERT_SETTING = "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)"
+DELETE_PROMPT = "DELETE FROM prompts WHERE id = ?"
+DELETE_PROMPT_IN_PROJECT = "DELETE FROM prompts WHERE id = ? AND project_id = ?"
+DELETE_PROJECT = "DELETE FROM projects WHERE id = ? AND name != 'Default'"
+REASSIGN_PROMPTS_TO_DEFAULT = """
+    UPDATE prompts
+    SET project_id = COALESCE((SELECT id FROM projects WHERE name = 'Default' LIMIT 1), project_id)
+    WHERE project_id = ?
+"""
+
+# INSERT ... RETURNING needs SQLite 3.35+; older versions re-select the new row
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+INSERT_PROMPT = """
+    INSERT INTO prompts (name, status, content, project_id, order_number)
+    VALUES (
+        ?, ?, ?,
+        COALESCE(?, (SELECT id FROM projects WHERE name = 'Default' LIMIT 1)),
+        (SELECT COALESCE(MAX(order_number), 0) + 1 FROM prompts WHERE status = ?)
+    )
+"""
+RETURNING_PROMPT = """
+    RETURNING *, (SELECT name FROM projects WHERE id = prompts.project_id) AS project_name
+"""
+
+
+def _prompts_query(project_id: int = None, status: str = None, limit: int = None, offset: int = 0):
+    """Build the prompt list query and its parameters for the given filters and page"""
+    conditions = []
+    params = []
     
-    return config.database_path
+    if project_id:
+        conditions.append("p.project_id = ?")
+        params.append(project_id)
+    
+    if status:
+        conditions.append("p.status = ?")
+        params.append(status)
+    
+    if conditions:
+        query = f"{SELECT_PROMPTS} WHERE {' AND '.join(conditions)} ORDER BY p.order_number ASC, p.created_at DESC"
+    else:
+        query = f"{SELECT_PROMPTS} ORDER BY p.order_number ASC, p.created_at DESC"
+    
+    # Page through the sorted rows (LIMIT -1 means no limit)
+    if limit is not None or offset:
+        query += " LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+    return query, params
 
 
 async def get_database():
     """Get async database connection"""
-    return await aiosqlite.connect(config.database_path)
+    db = await aiosqlite.connect(config.database_path)
+    for pragma in CONNECTION_PRAGMAS:
+        await db.execute(pragma)
+    return db
 
 
 class DatabaseManager:
     """Async database manager for Inkwell"""
     
+    # Long-lived connection shared by every method, opened on first use
+    _db = None
+    # Separate read-only connection for the reads that skip the lock: it never
+    # sees the shared connection's uncommitted writes, and WAL gives each of
+    # its queries a consistent snapshot
+    _read_db = None
+    # Serializes write transactions on the shared connection
+    _write_lock = None
+    # Result column names per query, keyed by its SQL constant
+    _column_cache = {}
+    
+    @classmethod
+    async def _connection(cls):
+        """Get the shared connection, opening it if needed"""
+        if cls._db is None:
+            db = await get_database()
+            if cls._db is None:
+                cls._db = db
+            else:
+                # Another request opened it while we were waiting
+                await db.close()
+        return cls._db
+    
+    @classmethod
+    async def _reader(cls):
+        """Get the read-only connection, opening it if needed"""
+        if cls._read_db is None:
+            db = await get_database()
+            await db.execute("PRAGMA query_only=ON")
+            if cls._read_db is None:
+                cls._read_db = db
+            else:
+                # Another request opened it while we were waiting
+                await db.close()
+        return cls._read_db
+    
+    @classmethod
+    @asynccontextmanager
+    async def _connect(cls):
+        """
+        Hold the shared connection for the duration of an `async with` block.
+        
+        Blocks run one at a time so their transactions don't interleave, and
+        anything a block leaves uncommitted (an error or an early return) is
+        rolled back before the next one starts.
+        """
+        if cls._write_lock is None:
+            cls._write_lock = asyncio.Lock()
+        async with cls._write_lock:
+            db = await cls._connection()
+            try:
+                yield db
+            finally:
+                if db.in_transaction:
+                    await db.rollback()
+    
+    @classmethod
+    def _columns_for(cls, query: str, cursor) -> tuple:
+        """Column names of a query's result, read from the cursor once and then cached"""
+        columns = cls._column_cache.get(query)
+        if columns is None:
+            columns = cls._column_cache[query] = tuple(description[0] for description in cursor.description)
+        return columns
+    
+    @classmethod
+    async def start(cls):
+        """Open the shared and read-only connections (call on application startup)"""
+        await cls._connection()
+        await cls._reader()
+    
+    @classmethod
+    async def close(cls):
+        """Close the shared and read-only connections (call on application shutdown)"""
+        if cls._read_db is not None:
+            read_db, cls._read_db = cls._read_db, None
+            await read_db.close()
+        if cls._db is not None:
+            db, cls._db = cls._db, None
+            cls._write_lock = None
+            await db.close()
+    
+    @classmethod
+    async def get_table_versions(cls):
+        """Get the change counter of every versioned table, keyed by table name, plus the database_id"""
+        db = await cls._reader()
+        async with db.execute(SELECT_TABLE_VERSIONS) as cursor:
+            return dict(await cursor.fetchall())
+    
     @staticmethod
     async def get_items():
         """Get all items from the database"""
-        async with aiosqlite.connect(config.database_path) as db:
-            async with db.execute("SELECT * FROM items ORDER BY created_at DESC") as cursor:
-                rows = await cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                return [dict(zip(columns, row)) for row in rows]
+        async with DatabaseManager._connect() as db:
+            async with db.execute(SELECT_ITEMS) as cursor:
+                columns = DatabaseManager._columns_for(SELECT_ITEMS, cursor)
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     
     @staticmethod
     async def create_item(name: str, description: str = None):
         """Create a new item in the database"""
-        async with aiosqlite.connect(config.database_path) as db:
+        async with DatabaseManager._connect() as db:
             await db.execute(
                 "INSERT INTO items (name, description) VALUES (?, ?)",
                 (name, description)
@@ -131,26 +416,26 @@ class DatabaseManager:
             await db.commit()
             
             # Get the created item
-            async with db.execute("SELECT * FROM items WHERE rowid = last_insert_rowid()") as cursor:
+            async with db.execute(SELECT_LAST_ITEM) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    columns = [description[0] for description in cursor.description]
+                    columns = DatabaseManager._columns_for(SELECT_LAST_ITEM, cursor)
                     return dict(zip(columns, row))
     
     @staticmethod
     async def get_item(item_id: int):
         """Get a specific item by ID"""
-        async with aiosqlite.connect(config.database_path) as db:
-            async with db.execute("SELECT * FROM items WHERE id = ?", (item_id,)) as cursor:
+        async with DatabaseManager._connect() as db:
+            async with db.execute(SELECT_ITEM_BY_ID, (item_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    columns = [description[0] for description in cursor.description]
+                    columns = DatabaseManager._columns_for(SELECT_ITEM_BY_ID, cursor)
                     return dict(zip(columns, row))
     
     @staticmethod
     async def update_item(item_id: int, name: str = None, description: str = None):
         """Update an item in the database"""
-        async with aiosqlite.connect(config.database_path) as db:
+        async with DatabaseManager._connect() as db:
             updates = []
             params = []
             
@@ -174,115 +459,89 @@ class DatabaseManager:
     
     @staticmethod
     async def delete_item(item_id: int):
-        """Delete an item from the database"""
-        async with aiosqlite.connect(config.database_path) as db:
-            await db.execute("DELETE FROM items WHERE id = ?", (item_id,))
+        """Delete an item from the database, returning the number of rows deleted"""
+        async with DatabaseManager._connect() as db:
+            cursor = await db.execute("DELETE FROM items WHERE id = ?", (item_id,))
             await db.commit()
+            return cursor.rowcount
     
     @staticmethod
     async def get_setting(key: str):
         """Get a setting value by key"""
-        async with aiosqlite.connect(config.database_path) as db:
-            async with db.execute("SELECT value FROM settings WHERE key = ?", (key,)) as cursor:
+        async with DatabaseManager._connect() as db:
+            async with db.execute(SELECT_SETTING, (key,)) as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else None
     
     @staticmethod
     async def set_setting(key: str, value: str):
         """Set a setting value"""
-        async with aiosqlite.connect(config.database_path) as db:
-            await db.execute(
-                "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
-                (key, value)
-            )
+        async with DatabaseManager._connect() as db:
+            await db.execute(UPSERT_SETTING, (key, value))
             await db.commit()
     
     # Prompts methods
-    @staticmethod
-    async def get_prompts(project_id: int = None, status: str = None):
-        """Get all prompts from the database, optionally filtered by project_id and status"""
-        async with aiosqlite.connect(config.database_path) as db:
-            base_query = """
-                SELECT p.*, proj.name as project_name 
-                FROM prompts p 
-                LEFT JOIN projects proj ON p.project_id = proj.id
-            """
-            
-            conditions = []
-            params = []
-            
-            if project_id:
-                conditions.append("p.project_id = ?")
-                params.append(project_id)
-            
-            if status:
-                conditions.append("p.status = ?")
-                params.append(status)
-            
-            if conditions:
-                query = f"{base_query} WHERE {' AND '.join(conditions)} ORDER BY p.order_number ASC, p.created_at DESC"
-            else:
-                query = f"{base_query} ORDER BY p.order_number ASC, p.created_at DESC"
-            
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                return [dict(zip(columns, row)) for row in rows]
+    @classmethod
+    async def get_prompts(cls, project_id: int = None, status: str = None, limit: int = None, offset: int = 0):
+        """Get prompts from the database, optionally filtered by project_id and status and paged by limit/offset"""
+        db = await cls._reader()
+        query, params = _prompts_query(project_id, status, limit, offset)
+        
+        async with db.execute(query, params) as cursor:
+            columns = cls._columns_for(SELECT_PROMPTS, cursor)
+            return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+    
+    @classmethod
+    async def iter_prompts(cls, project_id: int = None, status: str = None, limit: int = None, offset: int = 0):
+        """Yield prompts one row at a time, with the same filters, order and paging as get_prompts"""
+        db = await cls._reader()
+        query, params = _prompts_query(project_id, status, limit, offset)
+        
+        async with db.execute(query, params) as cursor:
+            columns = cls._columns_for(SELECT_PROMPTS, cursor)
+            async for row in cursor:
+                yield dict(zip(columns, row))
     
     @staticmethod
     async def create_prompt(name: str, status: str = 'draft', content: str = None, project_id: int = None):
         """Create a new prompt in the database"""
-        async with aiosqlite.connect(config.database_path) as db:
-            # If no project_id specified, use the Default project
-            if project_id is None:
-                async with db.execute("SELECT id FROM projects WHERE name = 'Default' LIMIT 1") as cursor:
+        async with DatabaseManager._connect() as db:
+            # One statement picks the Default project when none is given and the
+            # next order_number for the status, and returns the new row
+            if SUPPORTS_RETURNING:
+                async with db.execute(INSERT_PROMPT + RETURNING_PROMPT, (name, status, content, project_id, status)) as cursor:
                     row = await cursor.fetchone()
-                    project_id = row[0] if row else None
-            
-            # Get the next order_number by finding the max order_number and adding 1
-            async with db.execute("SELECT COALESCE(MAX(order_number), 0) + 1 FROM prompts WHERE status = ?", (status,)) as cursor:
-                row = await cursor.fetchone()
-                next_order_number = row[0] if row else 1
-                    
-            await db.execute(
-                "INSERT INTO prompts (name, status, content, project_id, order_number) VALUES (?, ?, ?, ?, ?)",
-                (name, status, content, project_id, next_order_number)
-            )
-            await db.commit()
+                    columns = DatabaseManager._columns_for(RETURNING_PROMPT, cursor)
+                await db.commit()
+            else:
+                await db.execute(INSERT_PROMPT, (name, status, content, project_id, status))
+                await db.commit()
+                async with db.execute(SELECT_PROMPTS + " WHERE p.rowid = last_insert_rowid()") as cursor:
+                    row = await cursor.fetchone()
+                    columns = DatabaseManager._columns_for(SELECT_PROMPTS, cursor)
             
-            # Get the created prompt with project name
-            query = """
-                SELECT p.*, proj.name as project_name 
-                FROM prompts p 
-                LEFT JOIN projects proj ON p.project_id = proj.id 
-                WHERE p.rowid = last_insert_rowid()
-            """
-            async with db.execute(query) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    columns = [description[0] for description in cursor.description]
-                    return dict(zip(columns, row))
+            if row:
+                return dict(zip(columns, row))
     
-    @staticmethod
-    async def get_prompt(prompt_id: int):
+    @classmethod
+    async def get_prompt(cls, prompt_id: int):
         """Get a specific prompt by ID"""
-        async with aiosqlite.connect(config.database_path) as db:
-            query = """
-                SELECT p.*, proj.name as project_name 
-                FROM prompts p 
-                LEFT JOIN projects proj ON p.project_id = proj.id 
-                WHERE p.id = ?
-            """
-            async with db.execute(query, (prompt_id,)) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    columns = [description[0] for description in cursor.description]
-                    return dict(zip(columns, row))
+        db = await cls._reader()
+        async with db.execute(SELECT_PROMPT_BY_ID, (prompt_id,)) as cursor:
+            row = await cursor.fetchone()
+            if row:
+                columns = cls._columns_for(SELECT_PROMPT_BY_ID, cursor)
+                return dict(zip(columns, row))
     
     @staticmethod
-    async def update_prompt(prompt_id: int, name: str = None, status: str = None, content: str = None, project_id: int = None, order_number: int = None):
-        """Update a prompt in the database"""
-        async with aiosqlite.connect(config.database_path) as db:
+    async def update_prompt(prompt_id: int, name: str = None, status: str = None, content: str = None, project_id: int = None, order_number: int = None, within_project_id: int = None):
+        """
+        Update a prompt in the database and return the updated prompt.
+        
+        When within_project_id is given, only a prompt belonging to that project
+        is updated. Returns None if no matching prompt exists.
+        """
+        async with DatabaseManager._connect() as db:
             updates = []
             params = []
             
@@ -306,37 +565,91 @@ class DatabaseManager:
                 updates.append("order_number = ?")
                 params.append(order_number)
             
+            conditions = ["id = ?"]
+            condition_params = [prompt_id]
+            if within_project_id is not None:
+                conditions.append("project_id = ?")
+                condition_params.append(within_project_id)
+            
             if updates:
                 updates.append("updated_at = CURRENT_TIMESTAMP")
-                params.append(prompt_id)
                 
-                await db.execute(
-                    f"UPDATE prompts SET {', '.join(updates)} WHERE id = ?",
-                    params
+                cursor = await db.execute(
+                    f"UPDATE prompts SET {', '.join(updates)} WHERE {' AND '.join(conditions)}",
+                    params + condition_params
                 )
+                if cursor.rowcount == 0:
+                    return None
                 await db.commit()
+            elif within_project_id is not None:
+                # Nothing to update, but still enforce the project scope
+                async with db.execute(
+                    "SELECT 1 FROM prompts WHERE id = ? AND project_id = ?",
+                    (prompt_id, within_project_id)
+                ) as cursor:
+                    if not await cursor.fetchone():
+                        return None
+            
+            # Return the updated prompt with project name
+            async with db.execute(SELECT_PROMPT_BY_ID, (prompt_id,)) as cursor:
+                row = await cursor.fetchone()
+                if row:
+                    columns = DatabaseManager._columns_for(SELECT_PROMPT_BY_ID, cursor)
+                    return dict(zip(columns, row))
     
     @staticmethod
-    async def delete_prompt(prompt_id: int):
-        """Delete a prompt from the database"""
-        async with aiosqlite.connect(config.database_path) as db:
-            await db.execute("DELETE FROM prompts WHERE id = ?", (prompt_id,))
+    async def get_prompts_by_ids(prompt_ids: list):
+        """Get several prompts in one query, returned as a dict keyed by prompt ID"""
+        if not prompt_ids:
+            return {}
+
+        async with DatabaseManager._connect() as db:
+            placeholders = ', '.join('?' for _ in prompt_ids)
+            query = f"{SELECT_PROMPTS} WHERE p.id IN ({placeholders})"
+            async with db.execute(query, list(prompt_ids)) as cursor:
+                columns = DatabaseManager._columns_for(SELECT_PROMPTS, cursor)
+                prompts = [dict(zip(columns, row)) for row in await cursor.fetchall()]
+                return {prompt['id']: prompt for prompt in prompts}
+
+    @staticmethod
+    async def bulk_update_order(orders: list):
+        """Update order_number for many prompts at once from (order_number, prompt_id) pairs"""
+        async with DatabaseManager._connect() as db:
+            await db.executemany(
+                "UPDATE prompts SET order_number = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                orders
+            )
             await db.commit()
+
+    @staticmethod
+    async def delete_prompt(prompt_id: int, within_project_id: int = None):
+        """
+        Delete a prompt from the database, returning the number of rows deleted.
+        
+        When within_project_id is given, only a prompt belonging to that project
+        is deleted.
+        """
+        async with DatabaseManager._connect() as db:
+            if within_project_id is None:
+                cursor = await db.execute(DELETE_PROMPT, (prompt_id,))
+            else:
+                cursor = await db.execute(DELETE_PROMPT_IN_PROJECT, (prompt_id, within_project_id))
+            await db.commit()
+            return cursor.rowcount
     
     # Projects methods
     @staticmethod
     async def get_projects():
         """Get all projects from the database"""
-        async with aiosqlite.connect(config.database_path) as db:
-            async with db.execute("SELECT * FROM projects ORDER BY name") as cursor:
-                rows = await cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                return [dict(zip(columns, row)) for row in rows]
+        async with DatabaseManager._connect() as db:
+            async with db.execute(SELECT_PROJECTS) as cursor:
+                columns = DatabaseManager._columns_for(SELECT_PROJECTS, cursor)
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     
     @staticmethod
     async def create_project(name: str):
         """Create a new project in the database"""
-        async with aiosqlite.connect(config.database_path) as db:
+        async with DatabaseManager._connect() as db:
             await db.execute(
                 "INSERT INTO projects (name) VALUES (?)",
                 (name,)
@@ -344,26 +657,26 @@ class DatabaseManager:
             await db.commit()
             
             # Get the created project
-            async with db.execute("SELECT * FROM projects WHERE rowid = last_insert_rowid()") as cursor:
+            async with db.execute(SELECT_LAST_PROJECT) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    columns = [description[0] for description in cursor.description]
+                    columns = DatabaseManager._columns_for(SELECT_LAST_PROJECT, cursor)
                     return dict(zip(columns, row))
     
-    @staticmethod
-    async def get_project(project_id: int):
+    @classmethod
+    async def get_project(cls, project_id: int):
         """Get a specific project by ID"""
-        async with aiosqlite.connect(config.database_path) as db:
-            async with db.execute("SELECT * FROM projects WHERE id = ?", (project_id,)) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    columns = [description[0] for description in cursor.description]
-                    return dict(zip(columns, row))
+        db = await cls._reader()
+        async with db.execute(SELECT_PROJECT_BY_ID, (project_id,)) as cursor:
+            row = await cursor.fetchone()
+            if row:
+                columns = cls._columns_for(SELECT_PROJECT_BY_ID, cursor)
+                return dict(zip(columns, row))
     
     @staticmethod
     async def update_project(project_id: int, name: str = None, whiteboard: str = None):
-        """Update a project in the database"""
-        async with aiosqlite.connect(config.database_path) as db:
+        """Update a project in the database and return it (None if it doesn't exist)"""
+        async with DatabaseManager._connect() as db:
             updates = []
             params = []
             
@@ -379,28 +692,40 @@ class DatabaseManager:
                 updates.append("updated_at = CURRENT_TIMESTAMP")
                 params.append(project_id)
                 
-                await db.execute(
+                cursor = await db.execute(
                     f"UPDATE projects SET {', '.join(updates)} WHERE id = ?",
                     params
                 )
+                if cursor.rowcount == 0:
+                    return None
                 await db.commit()
+            
+            # Return the updated project
+            async with db.execute(SELECT_PROJECT_BY_ID, (project_id,)) as cursor:
+                row = await cursor.fetchone()
+                if row:
+                    columns = DatabaseManager._columns_for(SELECT_PROJECT_BY_ID, cursor)
+                    return dict(zip(columns, row))
     
     @staticmethod
     async def delete_project(project_id: int):
-        """Delete a project from the database (and reassign its prompts to Default)"""
-        async with aiosqlite.connect(config.database_path) as db:
-            # Get the Default project ID
-            async with db.execute("SELECT id FROM projects WHERE name = 'Default' LIMIT 1") as cursor:
-                default_row = await cursor.fetchone()
-                default_id = default_row[0] if default_row else None
-                
-            if default_id:
-                # Reassign prompts to Default project
-                await db.execute(
-                    "UPDATE prompts SET project_id = ? WHERE project_id = ?",
-                    (default_id, project_id)
-                )
+        """
+        Delete a project from the database (and reassign its prompts to Default).
+        
+        The Default project itself is never deleted. Returns the number of
+        projects deleted.
+        """
+        async with DatabaseManager._connect() as db:
+            # Take the write lock up front so both statements commit together
+            await db.execute("BEGIN IMMEDIATE")
             
             # Delete the project
-            await db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-            await db.commit()
\ No newline at end of file
+            cursor = await db.execute(DELETE_PROJECT, (project_id,))
+            if cursor.rowcount == 0:
+                return 0
+            
+            # Reassign its prompts to the Default project
+            await db.execute(REASSIGN_PROMPTS_TO_DEFAULT, (project_id,))
+            
+            await db.commit()
+            return cursor.rowcount
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""Response classes for the Inkwell API"""
+
+from typing import AsyncIterable, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson instead of the stdlib json module"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Return True if the client asked for newline-delimited JSON via the Accept header"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(rows: AsyncIterable[dict]) -> StreamingResponse:
+    """Stream rows to the client as newline-delimited JSON, one row per line"""
+    return StreamingResponse(
+        (orjson.dumps(row) + b"\n" async for row in rows),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+def not_modified(request: Request, etag: str, vary: Optional[str] = None) -> Optional[Response]:
+    """Return a 304 response if the request's If-None-Match matches etag, else None"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if vary:
+            headers["Vary"] = vary
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def versions_etag(versions: dict, *tables: str) -> str:
+    """Weak ETag for data read from the given tables: the database ID plus each table's change counter"""
+    return 'W/"' + ".".join([versions["database_id"], *(str(versions[table]) for table in tables)]) + '"'
+
+
+def with_etag(response: Response, etag: str, vary: Optional[str] = None) -> Response:
+    """Attach an ETag to a response and ask clients to revalidate before reusing it"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if vary:
+        response.headers["Vary"] = vary
+    return response
\ No newline at end of file
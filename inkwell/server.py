@@ -1,76 +1,223 @@
 """FastAPI backend server for Inkwell"""
 
+import asyncio
+import functools
+import logging
+import os
+import sqlite3
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.staticfiles import StaticFiles
+
+import anyio
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from .database import init_database
+from .database import DatabaseManager, init_database
 from .config import config
+from .responses import ORJSONResponse, not_modified
 from .api import discover_and_register_routers
+from .assets import (
+    IMMUTABLE_CACHE_CONTROL, SMALL_FILE_SIZE, FrontendDispatchMiddleware, asset_response, list_files, load_asset,
+    load_assets, media_type_for, safe_rel
+)
+
+
+# uvicorn only configures its own loggers, so log through them to be seen
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database on startup and close the shared connection on shutdown"""
+    loop = asyncio.get_running_loop()
+    logger.info("Event loop: %s.%s", type(loop).__module__, type(loop).__qualname__)
+    logger.info("HTTP implementation: %s", config.uvicorn_options()["http"])
+    # Schema setup is blocking sqlite3 work (and may wait on another worker's
+    # lock), so run it off the event loop
+    await anyio.to_thread.run_sync(init_database)
+    await DatabaseManager.start()
+    yield
+    await DatabaseManager.close()
 
 
 # Create FastAPI app
 app = FastAPI(
     title="Inkwell API",
     description="Backend API for Inkwell application",
-    version="0.1.9"
+    version="0.1.9",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add CORS middleware for development
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[config.frontend_dev_url, config.backend_url, "http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# The backend serves the React build itself unless it is missing or disabled
+package_dir = Path(__file__).parent
+frontend_build_dir = package_dir / "frontend" / "build"
+serves_frontend = config.serve_frontend and frontend_build_dir.exists()
 
-# Auto-discover and register API routes
-discover_and_register_routers(app)
+# Add CORS middleware for development. When the backend serves the frontend
+# everything is same-origin, so it is left out unless asked for. Explicit
+# methods and headers let preflights answer from precomputed headers instead
+# of echoing the request's, and a frozenset makes the origin check a hash lookup
+if not serves_frontend or config.enable_cors:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=frozenset({config.frontend_dev_url, config.backend_url, "http://localhost:3000"}),
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+        allow_headers=["authorization", "content-type", "if-none-match"],
+    )
 
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on application startup"""
-    init_database()
+# Report database errors (e.g. a duplicate project name) with their message, as
+# the frontend displays `detail`. Handlers for specific exception types run
+# inside the CORS middleware, so cross-origin clients can read the response;
+# a catch-all Exception handler would run outside it
+@app.exception_handler(sqlite3.Error)
+async def database_exception_handler(request: Request, exc: sqlite3.Error):
+    """Translate database errors into a 500 response with a detail message"""
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
 
 
-# Static file serving for production
-package_dir = Path(__file__).parent
-frontend_build_dir = package_dir / "frontend" / "build"
+# FastAPI's own handlers for these render with the stdlib json module, whatever
+# the default response class; 404s and validation errors are common enough to matter
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """Render HTTP errors as {"detail": ...} with orjson"""
+    if exc.status_code in (204, 304) or exc.status_code < 200:
+        return Response(status_code=exc.status_code, headers=exc.headers)
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """Render request validation errors as a 422 with orjson"""
+    return ORJSONResponse(status_code=422, content={"detail": jsonable_encoder(exc.errors())})
 
-if frontend_build_dir.exists():
+
+# Auto-discover and register API routes
+discover_and_register_routers(app)
+
+# Frontend routes live on their own router, included last, so API requests
+# match before reaching the catch-all path
+frontend_router = APIRouter()
+
+if serves_frontend:
+    static_dir = (frontend_build_dir / "static").resolve()
+    build_dir_str = str(frontend_build_dir)
+    # Every file in the build (POSIX paths relative to it), so requests are
+    # matched without touching the filesystem; rebuild means restart
+    KNOWN_FILES = list_files(frontend_build_dir)
+    # index.html answers every client-side route, so keep it in memory too
+    INDEX_ASSET = load_asset(frontend_build_dir / "index.html") if "index.html" in KNOWN_FILES else None
+    # Hashed build assets, held in memory
+    static_assets = load_assets(static_dir)
+    # Small unhashed files at the top of the build (manifest.json, favicon.ico, ...),
+    # held in memory as well; larger ones are sent from disk
+    root_assets = {
+        file_path: load_asset(frontend_build_dir / file_path)
+        for file_path in KNOWN_FILES
+        if not file_path.startswith("static/")
+        and (frontend_build_dir / file_path).stat().st_size < SMALL_FILE_SIZE
+    }
+    
+    # Cached assets and client-side routes are answered before routing; the
+    # routes below still cover other methods and files served from disk
+    frontend_assets = {
+        f"/static/{file_path}": (asset, IMMUTABLE_CACHE_CONTROL)
+        for file_path, asset in static_assets.items()
+    }
+    frontend_assets.update(
+        (f"/{file_path}", (asset, "no-cache"))
+        for file_path, asset in root_assets.items()
+    )
+    app.add_middleware(
+        FrontendDispatchMiddleware,
+        assets=frontend_assets,
+        index=INDEX_ASSET,
+        passthrough_prefixes=("/api/", "/static/"),
+        passthrough_paths=frozenset(
+            {"/api", app.openapi_url, app.docs_url, app.redoc_url, app.swagger_ui_oauth2_redirect_url}
+            | {f"/{file_path}" for file_path in KNOWN_FILES}
+        )
+    )
+    
+    @functools.lru_cache(maxsize=2048)
+    def _stat(file_path: str) -> os.stat_result:
+        """Stat a file from the build (a KNOWN_FILES entry) once; the build doesn't change while running"""
+        return os.stat(build_dir_str + "/" + file_path)
+    
     # Serve static files from the React build
-    app.mount("/static", StaticFiles(directory=frontend_build_dir / "static"), name="static")
+    @frontend_router.api_route("/static/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def serve_static(request: Request, file_path: str):
+        """Serve a file from the React build's static directory (304 if the client's copy is current)"""
+        # Most requests are for cached assets - no filesystem access needed
+        asset = static_assets.get(file_path)
+        if asset is not None:
+            return asset_response(request, asset)
+        
+        # Only files from the build are served
+        if safe_rel(file_path) is None or f"static/{file_path}" not in KNOWN_FILES:
+            raise HTTPException(status_code=404, detail="Not Found")
+        
+        response = FileResponse(
+            build_dir_str + "/static/" + file_path,
+            stat_result=_stat(f"static/{file_path}"),
+            media_type=media_type_for(file_path)
+        )
+        return not_modified(request, response.headers["etag"]) or response
+    
+    # Unknown API paths get a 404 here rather than the React app; the API
+    # routers are registered earlier, so their routes still match first
+    @frontend_router.get("/api/{rest:path}", include_in_schema=False)
+    async def api_not_found(rest: str):
+        """404 for API routes that don't exist"""
+        raise HTTPException(status_code=404, detail="API endpoint not found")
     
     # Catch-all route to serve React app for client-side routing
-    @app.get("/{full_path:path}")
+    @frontend_router.api_route("/{full_path:path}", methods=["GET", "HEAD"])
     async def serve_react_app(request: Request, full_path: str):
         """Serve React app for all non-API routes"""
-        # Don't serve React app for API routes
-        if full_path.startswith("api/"):
-            raise HTTPException(status_code=404, detail="API endpoint not found")
+        # Traversal attempts are refused up front instead of getting the app shell
+        if safe_rel(full_path) is None:
+            raise HTTPException(status_code=404, detail="Not Found")
         
-        # Serve specific files if they exist
-        requested_file = frontend_build_dir / full_path
-        if requested_file.is_file():
-            return FileResponse(requested_file)
+        # Serve specific files if they exist - small ones from memory
+        asset = root_assets.get(full_path)
+        if asset is not None:
+            return asset_response(request, asset, cache_control="no-cache")
+        if full_path in KNOWN_FILES:
+            return FileResponse(
+                build_dir_str + "/" + full_path, stat_result=_stat(full_path), media_type=media_type_for(full_path)
+            )
         
-        # Otherwise, serve index.html for client-side routing
-        index_file = frontend_build_dir / "index.html"
-        if index_file.exists():
-            return FileResponse(index_file)
+        # Otherwise, serve index.html for client-side routing (revalidated on
+        # every load, as it points at the current hashed assets)
+        if INDEX_ASSET is not None:
+            return asset_response(request, INDEX_ASSET, cache_control="no-cache")
         else:
             raise HTTPException(status_code=404, detail="Frontend build not found")
 else:
-    # Development route when frontend build doesn't exist
+    # Development route when frontend build doesn't exist or is served elsewhere
     @app.get("/")
     async def root():
-        """Root endpoint when no frontend build exists"""
+        """Root endpoint when the backend doesn't serve the frontend"""
         return {
             "message": "Inkwell API is running",
-            "frontend": "Frontend build not found - run in development mode or build the frontend",
+            "frontend": (
+                "Frontend build not found - run in development mode or build the frontend"
+                if config.serve_frontend else "Frontend is served separately (INKWELL_SERVE_FRONTEND=0)"
+            ),
             "api_docs": f"{config.backend_url}/docs"
-        }
\ No newline at end of file
+        }
+
+# Register the frontend routes after everything else
+app.include_router(frontend_router)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("inkwell.server:app", access_log=False, **config.uvicorn_options())
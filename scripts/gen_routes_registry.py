@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Generate inkwell/api/_registry.py from the routes.py files under inkwell/api"""
+
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent / "inkwell" / "api"
+REGISTRY_FILE = API_DIR / "_registry.py"
+
+HEADER = '''"""Static API route registry - generated by scripts/gen_routes_registry.py, do not edit"""
+
+'''
+
+
+def find_route_modules():
+    """Return the dotted paths of every inkwell/api/<name>/routes.py module"""
+    return [
+        f"inkwell.api.{routes_file.parent.name}.routes"
+        for routes_file in sorted(API_DIR.glob("*/routes.py"))
+        if not routes_file.parent.name.startswith('_')
+    ]
+
+
+def main():
+    modules = find_route_modules()
+    lines = [HEADER, "# (routes module, router attribute) pairs, imported directly at startup\n", "ROUTERS = (\n"]
+    lines.extend(f'    ("{module}", "router"),\n' for module in modules)
+    lines.append(")\n")
+    REGISTRY_FILE.write_text("".join(lines))
+    print(f"Wrote {len(modules)} route modules to {REGISTRY_FILE}")
+
+
+if __name__ == '__main__':
+    main()